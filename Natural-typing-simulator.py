@@ -6,8 +6,17 @@ import threading
 import pyautogui
 import json
 import os
+import platform
+import statistics
+import asyncio
+import heapq
+import itertools
+import sys
 
 class NaturalTypingSimulator:
+    # Number of test keystrokes sent while calibrating
+    CALIBRATION_SAMPLES = 20
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Natural Typing Simulator")
@@ -19,8 +28,12 @@ class NaturalTypingSimulator:
         self.typing_thread = None
         self.config_file = "typing_config.json"
         
+        self.is_calibrating = False
+        self.calibration_window = None
+        
         # Load configuration
         self.config = self.load_config()
+        self.config.setdefault("calibration", {})
         
         # Create UI
         self.create_widgets()
@@ -31,6 +44,10 @@ class NaturalTypingSimulator:
         # Focus on text area for easy pasting
         self.root.after(100, lambda: self.text_area.focus())
         
+        # Offer timing calibration on first launch on this host/backend
+        if self.get_calibration_key() not in self.config["calibration"]:
+            self.root.after(500, self.prompt_calibration)
+        
     def load_config(self):
         """Load configuration from file or create default"""
         default_config = {
@@ -43,7 +60,8 @@ class NaturalTypingSimulator:
             "default_delay": 3,
             "default_typo_prob": 3,
             "default_synonym_prob": 2,
-            "default_mode": "natural"
+            "default_mode": "natural",
+            "calibration": {}
         }
         
         try:
@@ -226,7 +244,7 @@ class NaturalTypingSimulator:
         """Open settings window for custom shortcuts"""
         settings_window = tk.Toplevel(self.root)
         settings_window.title("Typing Settings")
-        settings_window.geometry("400x300")
+        settings_window.geometry("400x340")
         settings_window.resizable(False, False)
         
         ttk.Label(settings_window, text="Custom Shortcuts", font=("Arial", 12, "bold")).pack(pady=10)
@@ -274,7 +292,8 @@ class NaturalTypingSimulator:
             settings_window.destroy()
             messagebox.showinfo("Settings", "Settings saved successfully!")
         
-        ttk.Button(settings_window, text="Save Settings", command=save_settings).pack(pady=20)
+        ttk.Button(settings_window, text="Save Settings", command=save_settings).pack(pady=(20, 5))
+        ttk.Button(settings_window, text="Recalibrate Timing", command=self.start_calibration).pack(pady=5)
         
     def update_button_text(self):
         """Update button text with current shortcuts"""
@@ -288,6 +307,10 @@ class NaturalTypingSimulator:
         if self.is_typing:
             return
             
+        if self.is_calibrating:
+            self.status_var.set("Please wait for timing calibration to finish.")
+            return
+            
         text = self.text_area.get("1.0", tk.END).strip()
         if not text:
             self.status_var.set("Please enter some text to type.")
@@ -350,7 +373,8 @@ class NaturalTypingSimulator:
         self.stop_button.config(state=tk.DISABLED)
         self.status_var.set("Typing stopped.")
         
-    def get_synonyms(self):
+    @staticmethod
+    def get_synonyms():
         """Return a comprehensive dictionary of synonyms for NATURAL MODE ONLY"""
         return {
             'happy': ['joyful', 'cheerful', 'delighted', 'pleased', 'content', 'ecstatic', 'elated', 'glad', 'jubilant', 'thrilled'],
@@ -525,7 +549,8 @@ class NaturalTypingSimulator:
             'apologize': ['regret', 'repent', 'rue', 'lament', 'bemoan', 'bewail', 'deplore', 'mourn', 'grieve', 'sorrow'],
         }
         
-    def get_adjacent_key(self, char):
+    @staticmethod
+    def get_adjacent_key(char):
         """Return a commonly mistyped adjacent key for the given character"""
         # QWERTY keyboard layout adjacent keys
         adjacent_keys = {
@@ -563,26 +588,143 @@ class NaturalTypingSimulator:
             return random.choice(adjacent_keys[char_lower])
         return char
         
-    def type_text(self, text, target_wpm, delay, typo_probability, synonym_probability, mode):
-        """Fixed timing system that strictly follows target WPM"""
-        # Wait for the specified delay
-        time.sleep(delay)
+    def get_calibration_key(self):
+        """Return the config key identifying this host and input backend"""
+        display = os.environ.get("XDG_SESSION_TYPE") or platform.system().lower()
+        return f"{platform.node()}/pyautogui-{display}"
+        
+    def get_timing_profile(self):
+        """Return the cached timing profile for this host/backend, if any"""
+        return self.config.get("calibration", {}).get(self.get_calibration_key())
+        
+    def prompt_calibration(self):
+        """Ask before the first calibration, since it sends test keystrokes"""
+        if messagebox.askyesno("Timing Calibration",
+                               "Calibrate typing timing for this machine?\n\n"
+                               "A small calibration window will open and a test character will be "
+                               f"typed and deleted in it {self.CALIBRATION_SAMPLES} times. "
+                               "Keep that window focused for a few seconds. "
+                               "You can run it later from settings (⚙️)."):
+            self.start_calibration()
+        else:
+            # Remember the answer so we don't ask again on every launch
+            self.config["calibration"][self.get_calibration_key()] = None
+            self.save_config()
         
-        if not self.is_typing:
+    def start_calibration(self):
+        """Run timing calibration in a separate thread to keep UI responsive"""
+        if self.is_typing or self.is_calibrating:
             return
             
-        self.root.after(0, lambda: self.status_var.set("Typing in progress..."))
+        self.is_calibrating = True
+        self.start_button.config(state=tk.DISABLED)
+        self.status_var.set("Calibrating timing: typing test keystrokes into the calibration window...")
+        
+        # Test keystrokes go into our own entry so they never reach another app
+        self.calibration_window = tk.Toplevel(self.root)
+        self.calibration_window.title("Calibrating...")
+        ttk.Label(self.calibration_window, text="Measuring typing timing, keep this window focused.").pack(padx=20, pady=(15, 5))
+        calibration_entry = ttk.Entry(self.calibration_window, width=10)
+        calibration_entry.pack(pady=(0, 15))
+        calibration_entry.focus_force()
+        
+        # Give the window manager a moment to hand over focus
+        self.root.after(300, lambda: self.launch_calibration(calibration_entry))
+        
+    def launch_calibration(self, calibration_entry):
+        """Start measuring once the calibration entry has keyboard focus"""
+        if self.root.focus_get() is not calibration_entry:
+            self.finish_calibration(None, "calibration window did not get keyboard focus")
+            return
+            
+        calibration_thread = threading.Thread(target=self.run_calibration)
+        calibration_thread.daemon = True
+        calibration_thread.start()
+        
+    def run_calibration(self):
+        """Measure timing on the worker thread and hand the result to the UI thread"""
+        try:
+            profile = self.calibrate_timing(self.CALIBRATION_SAMPLES)
+            error = None
+        except Exception as e:
+            profile = None
+            error = e
+            
+        self.root.after(0, lambda: self.finish_calibration(profile, error))
+        
+    def finish_calibration(self, profile, error):
+        """Cache the measured profile in the config and restore the UI"""
+        self.calibration_window.destroy()
         
+        if profile is not None:
+            self.config.setdefault("calibration", {})[self.get_calibration_key()] = profile
+            self.save_config()
+            self.status_var.set(f"Calibration done: sleep +{profile['sleep_oversleep'] * 1000:.2f} ms, "
+                                f"write {profile['write_latency'] * 1000:.1f} ms, "
+                                f"press {profile['press_latency'] * 1000:.1f} ms")
+        else:
+            self.status_var.set(f"Calibration failed: {error}")
+            
+        self.is_calibrating = False
+        self.start_button.config(state=tk.NORMAL)
+        
+    def calibrate_timing(self, samples=20):
+        """Micro-benchmark sleep oversleep and pyautogui call latencies"""
+        def percentile(values, fraction):
+            ordered = sorted(values)
+            return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+        
+        # How much longer than requested time.sleep actually takes
+        oversleeps = []
+        for duration in (0.001, 0.005, 0.02):
+            for _ in range(samples):
+                start = time.perf_counter()
+                time.sleep(duration)
+                oversleeps.append(max(0.0, time.perf_counter() - start - duration))
+        
+        # Cost of the same calls type_text makes: write a character into the
+        # focused calibration entry, then press backspace to delete it again
+        write_latencies = []
+        press_latencies = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            pyautogui.write('x')
+            write_latencies.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            pyautogui.press('backspace')
+            press_latencies.append(time.perf_counter() - start)
+        
+        return {
+            "sleep_oversleep": round(statistics.median(oversleeps), 6),
+            "sleep_oversleep_p90": round(percentile(oversleeps, 0.9), 6),
+            "write_latency": round(statistics.median(write_latencies), 6),
+            "press_latency": round(statistics.median(press_latencies), 6),
+            "samples": samples,
+            "calibrated_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+    def corrected_sleep(self, duration, call_latency, profile):
+        """Sleep for duration minus the measured call latency and sleep oversleep"""
+        remaining = duration - call_latency - profile.get("sleep_oversleep", 0.0)
+        if remaining > 0:
+            time.sleep(remaining)
+        
+    @staticmethod
+    def generate_keystrokes(text, target_wpm, typo_probability, synonym_probability, mode):
+        """Yield (action, key, delay_after, position) for every keystroke of a run
+        
+        action is "write" or "press", delay_after is the pause before the next
+        keystroke and position is how many characters of text are done.
+        """
         # Calculate base time per character (seconds per character)
         # FIXED: Proper calculation for high WPM
         base_time_per_char = 60.0 / (target_wpm * 5) if target_wpm > 0 else 0.1
         
         i = 0
-        synonyms = self.get_synonyms() if mode == "natural" else {}
-        start_time = time.time()
-        characters_typed = 0
+        synonyms = NaturalTypingSimulator.get_synonyms() if mode == "natural" else {}
         
-        while i < len(text) and self.is_typing:
+        while i < len(text):
             char = text[i]
             
             # Handle word boundaries for synonym replacement (Natural mode only)
@@ -601,45 +743,36 @@ class NaturalTypingSimulator:
                     
                     synonym = random.choice(synonyms[current_word.lower()])
                     
-                    # Type the synonym quickly
-                    for syn_char in synonym:
-                        pyautogui.write(syn_char)
-                        time.sleep(base_time_per_char * 0.1)  # Very fast typing
+                    # Type the synonym quickly, then wait a bit before deleting it
+                    for k, syn_char in enumerate(synonym):
+                        pause = 0.3 if k == len(synonym) - 1 else 0.0
+                        yield "write", syn_char, base_time_per_char * (0.1 + pause), i  # Very fast typing
                     
-                    # Wait a bit then delete the synonym
-                    time.sleep(base_time_per_char * 0.3)
                     for _ in range(len(synonym)):
-                        pyautogui.press('backspace')
-                        time.sleep(base_time_per_char * 0.05)
+                        yield "press", "backspace", base_time_per_char * 0.05, i
                     
                     # Type the correct word
-                    for word_char in current_word:
-                        pyautogui.write(word_char)
+                    for k, word_char in enumerate(current_word):
                         # Use consistent timing for the correct word
-                        time.sleep(base_time_per_char)
+                        yield "write", word_char, base_time_per_char, i + k + 1
                     
                     i = j
-                    characters_typed += len(current_word)
                     continue
             
             # Handle typos (Natural mode only)
             if mode == "natural" and (char.isalpha() or char == ' ') and random.random() < typo_probability:
                 # Make a typo
-                typo_char = self.get_adjacent_key(char)
-                pyautogui.write(typo_char)
-                time.sleep(base_time_per_char * 0.3)
+                typo_char = NaturalTypingSimulator.get_adjacent_key(char)
+                yield "write", typo_char, base_time_per_char * 0.3, i
                 
                 # Correct the typo
-                pyautogui.press('backspace')
-                time.sleep(base_time_per_char * 0.2)
+                yield "press", "backspace", base_time_per_char * 0.2, i
                 
                 # Type correct character
-                pyautogui.write(char)
                 delay_time = base_time_per_char
                 
             else:
                 # Normal typing - COMPETITION MODE: 100% consistent, NATURAL: with variations
-                pyautogui.write(char)
                 if mode == "competition":
                     # Competition mode: perfectly consistent timing
                     delay_time = base_time_per_char
@@ -664,16 +797,53 @@ class NaturalTypingSimulator:
                     if random.random() < 0.03:  # 3% chance of thinking pause
                         delay_time *= random.uniform(2, 5)
             
-            time.sleep(delay_time)
+            yield "write", char, delay_time, i + 1
             i += 1
-            characters_typed += 1
+        
+    def type_text(self, text, target_wpm, delay, typo_probability, synonym_probability, mode):
+        """Fixed timing system that strictly follows target WPM"""
+        # Wait for the specified delay
+        time.sleep(delay)
+        
+        if not self.is_typing:
+            return
+            
+        self.root.after(0, lambda: self.status_var.set("Typing in progress..."))
+        
+        # Pre-correct delays using this machine's calibrated timing
+        profile = self.get_timing_profile() or {}
+        latencies = {
+            "write": profile.get("write_latency", 0.0),
+            "press": profile.get("press_latency", 0.0)
+        }
+        
+        start_time = time.time()
+        characters_typed = 0
+        at_character_boundary = True
+        
+        for action, key, delay_time, position in self.generate_keystrokes(
+                text, target_wpm, typo_probability, synonym_probability, mode):
+            # Only stop between characters so typo and synonym corrections finish
+            if at_character_boundary and not self.is_typing:
+                break
+                
+            if action == "write":
+                pyautogui.write(key)
+            else:
+                pyautogui.press(key)
+            self.corrected_sleep(delay_time, latencies[action], profile)
+            
+            at_character_boundary = position != characters_typed
+            if not at_character_boundary:
+                continue
+            characters_typed = position
             
             # Calculate and display real-time WPM
-            if characters_typed % 10 == 0 or i == len(text):
+            if characters_typed % 10 == 0 or characters_typed == len(text):
                 elapsed_time = time.time() - start_time
                 if elapsed_time > 0:
                     current_wpm = (characters_typed / 5) / (elapsed_time / 60)
-                    progress = int((i / len(text)) * 100)
+                    progress = int((characters_typed / len(text)) * 100)
                     mode_status = f" - Current: {int(current_wpm)} WPM" if mode == "natural" else f" - Target: {target_wpm} WPM"
                     self.root.after(0, lambda p=progress, m=mode_status: 
                                   self.status_var.set(f"Typing... {p}% complete{m}"))
@@ -686,7 +856,205 @@ class NaturalTypingSimulator:
             self.root.after(0, lambda: self.start_button.config(state=tk.NORMAL))
             self.root.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
 
+
+class PyAutoGUIBackend:
+    """Send keystrokes to the focused window through pyautogui
+    
+    Meant for a single session: every instance types into the same focused
+    window, and each call blocks the event loop while the key is sent. Give
+    concurrent sessions their own backend objects with write/press methods.
+    """
+    def write(self, char):
+        # Skip pyautogui's built-in pause, the engine does all the timing
+        pyautogui.write(char, _pause=False)
+        
+    def press(self, key):
+        pyautogui.press(key, _pause=False)
+
+
+class RecordingBackend:
+    """Record keystrokes with timestamps instead of sending them anywhere"""
+    def __init__(self):
+        self.events = []
+        
+    def write(self, char):
+        self.events.append((time.perf_counter(), "write", char))
+        
+    def press(self, key):
+        self.events.append((time.perf_counter(), "press", key))
+        
+    def get_text(self):
+        """Return the text a target would contain after these keystrokes"""
+        typed = []
+        for _, action, key in self.events:
+            if action == "write":
+                typed.append(key)
+            elif key == "backspace" and typed:
+                typed.pop()
+        return "".join(typed)
+
+
+class TypingSession:
+    """State of one typing run scheduled on an AsyncTypingEngine"""
+    def __init__(self, keystrokes, backend, future):
+        self.keystrokes = keystrokes
+        self.backend = backend
+        self.future = future
+        self.start_time = None
+        self.keystrokes_sent = 0
+        self.total_error = 0.0
+        self.max_error = 0.0
+        
+    def get_stats(self, end_time):
+        """Return keystroke count, duration and timing error of the session"""
+        return {
+            "keystrokes": self.keystrokes_sent,
+            "elapsed": end_time - self.start_time,
+            "mean_timing_error": self.total_error / self.keystrokes_sent if self.keystrokes_sent else 0.0,
+            "max_timing_error": self.max_error
+        }
+
+
+class AsyncTypingEngine:
+    """Run many typing sessions concurrently on one asyncio event loop
+    
+    The next keystroke of every session sits in one heap of deadlines that is
+    drained by a single loop timer, so hundreds of simulated typists share one
+    thread. Deadlines are absolute, so a late keystroke does not push back the
+    rest of its session. Cancel the task awaiting type_text to stop a session.
+    """
+    def __init__(self):
+        self.deadlines = []
+        self.sequence = itertools.count()
+        self.timer = None
+        self.timer_deadline = None
+        self.loop = None
+        
+    async def type_text(self, text, backend=None, target_wpm=50, delay=0,
+                        typo_probability=0, synonym_probability=0, mode="natural"):
+        """Type text into backend and return the session's timing stats
+        
+        Probabilities are fractions (0.03 for 3%) like in the threaded engine.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not None and self.loop is not loop and self.loop.is_closed():
+            # Sessions left over from a finished loop can never run
+            self.deadlines = []
+            self.timer = None
+            self.loop = None
+            
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("AsyncTypingEngine is already running on another event loop")
+            
+        keystrokes = NaturalTypingSimulator.generate_keystrokes(
+            text, target_wpm, typo_probability, synonym_probability, mode)
+        session = TypingSession(keystrokes, backend or PyAutoGUIBackend(), loop.create_future())
+        session.start_time = loop.time() + delay
+        self.schedule(session, session.start_time)
+        
+        try:
+            return await session.future
+        finally:
+            keystrokes.close()
+            self.unschedule(session)
+            
+    def unschedule(self, session):
+        """Drop any pending keystroke of session, e.g. after it was cancelled"""
+        remaining = [entry for entry in self.deadlines if entry[2] is not session]
+        if len(remaining) != len(self.deadlines):
+            heapq.heapify(remaining)
+            self.deadlines = remaining
+            self.arm_timer()
+            
+    def schedule(self, session, deadline):
+        """Queue the next keystroke of session and re-arm the timer if needed"""
+        heapq.heappush(self.deadlines, (deadline, next(self.sequence), session))
+        if self.timer is None or deadline < self.timer_deadline:
+            self.arm_timer()
+            
+    def arm_timer(self):
+        """Point the loop timer at the earliest pending deadline"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+            
+        if not self.deadlines:
+            self.loop = None
+            return
+            
+        self.timer_deadline = self.deadlines[0][0]
+        self.timer = self.loop.call_at(self.timer_deadline, self.on_timer)
+        
+    def on_timer(self):
+        """Send every keystroke that is due and schedule each session's next one"""
+        self.timer = None
+        
+        try:
+            while self.deadlines and self.deadlines[0][0] <= self.loop.time():
+                deadline, _, session = heapq.heappop(self.deadlines)
+                if session.future.done():
+                    continue
+                self.send_next_keystroke(session, deadline)
+        finally:
+            self.arm_timer()
+        
+    def send_next_keystroke(self, session, deadline):
+        """Send one keystroke of session and push its following deadline"""
+        now = self.loop.time()
+        try:
+            action, key, delay_after, _ = next(session.keystrokes)
+        except StopIteration:
+            session.future.set_result(session.get_stats(now))
+            return
+        except Exception as e:
+            session.future.set_exception(e)
+            return
+            
+        try:
+            if action == "write":
+                session.backend.write(key)
+            else:
+                session.backend.press(key)
+        except Exception as e:
+            session.future.set_exception(e)
+            return
+            
+        error = abs(now - deadline)
+        session.keystrokes_sent += 1
+        session.total_error += error
+        session.max_error = max(session.max_error, error)
+        heapq.heappush(self.deadlines, (deadline + delay_after, next(self.sequence), session))
+
+
+def benchmark_async_engine(session_counts=(1, 10, 50, 100, 250, 500), target_wpm=120):
+    """Print the timing error of the async engine as the session count grows"""
+    text = "The quick brown fox jumps over the lazy dog. " * 2
+    
+    async def run(count):
+        engine = AsyncTypingEngine()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            engine.type_text(text, RecordingBackend(), target_wpm=target_wpm, mode="competition")
+            for _ in range(count)
+        ))
+        return results, time.perf_counter() - start
+    
+    print(f"{'sessions':>8} {'keystrokes':>10} {'mean err ms':>12} {'max err ms':>11} {'wall s':>7}")
+    for count in session_counts:
+        results, wall_time = asyncio.run(run(count))
+        keystrokes = sum(r["keystrokes"] for r in results)
+        mean_error = sum(r["mean_timing_error"] * r["keystrokes"] for r in results) / keystrokes
+        max_error = max(r["max_timing_error"] for r in results)
+        print(f"{count:>8} {keystrokes:>10} {mean_error * 1000:>12.3f} {max_error * 1000:>11.3f} {wall_time:>7.2f}")
+
+
 if __name__ == "__main__":
+    if "--benchmark-async" in sys.argv:
+        benchmark_async_engine()
+        sys.exit(0)
+        
     root = tk.Tk()
     app = NaturalTypingSimulator(root)
     root.mainloop()